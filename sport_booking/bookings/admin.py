@@ -1,14 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, SportField, Booking
+from .models import User, SportField, Booking, ArchivedBooking, PricingRule
 
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
-    list_display = ['username', 'email', 'first_name', 'last_name', 'role', 'phone_number']
-    list_filter = ['role', 'is_staff', 'is_active']
+    list_display = ['username', 'email', 'first_name', 'last_name', 'role', 'is_member', 'phone_number']
+    list_filter = ['role', 'is_member', 'is_staff', 'is_active']
     fieldsets = BaseUserAdmin.fieldsets + (
-        ('ข้อมูลเพิ่มเติม', {'fields': ('phone_number', 'role')}),
+        ('ข้อมูลเพิ่มเติม', {'fields': ('phone_number', 'role', 'is_member')}),
     )
 
 
@@ -19,9 +19,30 @@ class SportFieldAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
 
 
+@admin.register(PricingRule)
+class PricingRuleAdmin(admin.ModelAdmin):
+    list_display = ['name', 'sport_field', 'days', 'start_time', 'end_time', 'members_only', 'multiplier', 'is_active']
+    list_filter = ['days', 'members_only', 'is_active', 'sport_field']
+    search_fields = ['name']
+
+
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     list_display = ['id', 'user', 'sport_field', 'booking_date', 'start_time', 'end_time', 'total_price', 'status']
     list_filter = ['status', 'booking_date', 'sport_field']
     search_fields = ['user__username', 'sport_field__name']
-    date_hierarchy = 'booking_date'
\ No newline at end of file
+    date_hierarchy = 'booking_date'
+
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'sport_field', 'booking_date', 'start_time', 'end_time', 'total_price', 'status', 'archived_at']
+    list_filter = ['status', 'booking_date', 'sport_field']
+    search_fields = ['user__username', 'sport_field__name']
+    date_hierarchy = 'booking_date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
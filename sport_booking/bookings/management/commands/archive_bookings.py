@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from bookings.models import Booking, ArchivedBooking
+
+
+class Command(BaseCommand):
+    help = 'ย้ายการจองที่เสร็จสิ้น/ยกเลิกและเก่ากว่าระยะที่กำหนดไปยังตาราง ArchivedBooking'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.BOOKING_ARCHIVE_AFTER_DAYS,
+            help='ย้ายการจองที่วันที่จองเก่ากว่าจำนวนวันนี้',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.BOOKING_ARCHIVE_BATCH_SIZE,
+            help='จำนวนรายการต่อหนึ่ง transaction',
+        )
+        parser.add_argument(
+            '--max-batches', type=int, default=None,
+            help='หยุดหลังจากย้ายครบจำนวน batch นี้ (รันต่อได้ภายหลัง)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='แสดงจำนวนที่จะถูกย้ายโดยไม่แก้ไขข้อมูล')
+    
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days ต้องไม่ติดลบ')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size ต้องมากกว่า 0')
+        
+        cutoff = timezone.localdate() - timedelta(days=options['days'])
+        candidates = Booking.objects.filter(
+            status__in=ArchivedBooking.ARCHIVABLE_STATUSES,
+            booking_date__lt=cutoff,
+        ).order_by('pk')
+        
+        if options['dry_run']:
+            self.stdout.write(f'จะย้าย {candidates.count()} รายการ (ก่อนวันที่ {cutoff})')
+            return
+        
+        moved = 0
+        batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            # แต่ละ batch commit แยกกัน หากหยุดกลางทางสามารถรันคำสั่งซ้ำเพื่อทำต่อได้
+            # ถ้า id ซ้ำกับข้อมูลใน archive อยู่แล้ว จะ rollback ทั้ง batch แทนที่จะลบข้อมูลที่ยังไม่ได้ย้าย
+            try:
+                with transaction.atomic():
+                    batch = list(candidates.select_for_update()[:options['batch_size']])
+                    if not batch:
+                        break
+                    ArchivedBooking.objects.bulk_create(
+                        [ArchivedBooking.from_booking(booking) for booking in batch]
+                    )
+                    Booking.objects.filter(pk__in=[booking.pk for booking in batch]).delete()
+            except IntegrityError as e:
+                raise CommandError(
+                    f'ย้ายได้ {moved} รายการ แล้วพบ id ที่มีอยู่ใน archive แล้ว (batch นี้ถูก rollback): {e}'
+                )
+            moved += len(batch)
+            batches += 1
+            self.stdout.write(f'batch {batches}: ย้ายแล้ว {moved} รายการ')
+        
+        self.stdout.write(self.style.SUCCESS(f'ย้ายการจองทั้งหมด {moved} รายการ (ก่อนวันที่ {cutoff})'))
@@ -0,0 +1,53 @@
+import threading
+
+from django.conf import settings
+from django.http import JsonResponse
+
+
+class AdmissionControlMiddleware:
+    """
+    จำกัดจำนวน request ที่เขียนข้อมูล (POST/PUT/PATCH/DELETE) ที่ทำงานพร้อมกัน
+    request ที่เกิน MAX_CONCURRENT จะรอในคิวได้ไม่เกิน MAX_QUEUE รายการและไม่เกิน QUEUE_TIMEOUT วินาที
+    ถ้าคิวเต็มหรือรอนานเกินจะตอบ 429 พร้อม Retry-After ทันที แทนที่จะปล่อยให้ latency สูงขึ้นเรื่อยๆ
+    """
+    WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.BOOKING_ADMISSION
+        self.path_prefix = config['PATH_PREFIX']
+        self.max_concurrent = config['MAX_CONCURRENT']
+        self.max_queue = config['MAX_QUEUE']
+        self.queue_timeout = config['QUEUE_TIMEOUT']
+        self.retry_after = config['RETRY_AFTER']
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._pending = 0  # กำลังทำงาน + รอในคิว
+    
+    def __call__(self, request):
+        if request.method not in self.WRITE_METHODS or not request.path.startswith(self.path_prefix):
+            return self.get_response(request)
+        
+        with self._lock:
+            if self._pending >= self.max_concurrent + self.max_queue:
+                return self.reject()
+            self._pending += 1
+        
+        try:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                return self.reject()
+            try:
+                return self.get_response(request)
+            finally:
+                self._slots.release()
+        finally:
+            with self._lock:
+                self._pending -= 1
+    
+    def reject(self):
+        response = JsonResponse(
+            {'error': 'ระบบมีผู้ใช้งานจำนวนมาก กรุณาลองใหม่อีกครั้ง'},
+            status=429,
+        )
+        response['Retry-After'] = str(self.retry_after)
+        return response
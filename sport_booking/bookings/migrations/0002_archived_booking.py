@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('booking_date', models.DateField(verbose_name='วันที่จอง')),
+                ('start_time', models.TimeField(verbose_name='เวลาเริ่มต้น')),
+                ('end_time', models.TimeField(verbose_name='เวลาสิ้นสุด')),
+                ('hours', models.DecimalField(decimal_places=1, max_digits=4, verbose_name='จำนวนชั่วโมง')),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='ราคารวม')),
+                ('status', models.CharField(choices=[('pending', 'รอยืนยัน'), ('confirmed', 'ยืนยันแล้ว'), ('cancelled', 'ยกเลิก'), ('completed', 'เสร็จสิ้น')], max_length=20, verbose_name='สถานะ')),
+                ('note', models.TextField(blank=True, verbose_name='หมายเหตุ')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'การจอง (ย้อนหลัง)',
+                'verbose_name_plural': 'การจอง (ย้อนหลัง)',
+                'ordering': ['-booking_date', '-start_time'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['sport_field', 'booking_date'], name='booking_field_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='sport_field',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bookings', to='bookings.sportfield', verbose_name='สนาม'),
+        ),
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bookings', to=settings.AUTH_USER_MODEL, verbose_name='ผู้จอง'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedbooking',
+            index=models.Index(fields=['user', 'booking_date'], name='archived_user_date_idx'),
+        ),
+    ]
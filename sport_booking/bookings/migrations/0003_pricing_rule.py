@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:14
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_archived_booking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='ชื่อกฎ')),
+                ('days', models.CharField(choices=[('all', 'ทุกวัน'), ('weekday', 'จันทร์-ศุกร์'), ('weekend', 'เสาร์-อาทิตย์')], default='all', max_length=10, verbose_name='วัน')),
+                ('start_time', models.TimeField(blank=True, null=True, verbose_name='เวลาเริ่มต้น')),
+                ('end_time', models.TimeField(blank=True, null=True, verbose_name='เวลาสิ้นสุด')),
+                ('members_only', models.BooleanField(default=False, verbose_name='เฉพาะสมาชิก')),
+                ('multiplier', models.DecimalField(decimal_places=3, help_text='เช่น 1.200 = แพงขึ้น 20%, 0.900 = ลด 10%', max_digits=5, validators=[django.core.validators.MinValueValidator(0)], verbose_name='ตัวคูณราคา')),
+                ('is_active', models.BooleanField(default=True, verbose_name='ใช้งาน')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sport_field', models.ForeignKey(blank=True, help_text='เว้นว่างเพื่อใช้กับทุกสนาม', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pricing_rules', to='bookings.sportfield', verbose_name='สนาม')),
+            ],
+            options={
+                'verbose_name': 'กฎราคา',
+                'verbose_name_plural': 'กฎราคา',
+                'ordering': ['sport_field', 'name'],
+            },
+        ),
+    ]
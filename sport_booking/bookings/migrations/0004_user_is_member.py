@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_pricing_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='is_member',
+            field=models.BooleanField(default=False, help_text='ได้รับราคาจากกฎราคาที่ตั้งเป็น "เฉพาะสมาชิก"', verbose_name='สมาชิก'),
+        ),
+    ]
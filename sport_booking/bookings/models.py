@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.utils import timezone
 from datetime import datetime, time
 from decimal import Decimal, ROUND_UP
 
@@ -14,6 +16,7 @@ class User(AbstractUser):
     
     phone_number = models.CharField(max_length=10, blank=True, null=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user')
+    is_member = models.BooleanField(default=False, verbose_name='สมาชิก', help_text='ได้รับราคาจากกฎราคาที่ตั้งเป็น "เฉพาะสมาชิก"')
     image = models.ImageField(upload_to='sport_fields/', blank=True, null=True, verbose_name='รูปภาพ')
     
     def __str__(self):
@@ -55,6 +58,73 @@ class SportField(models.Model):
         return f"{self.name} ({self.get_sport_type_display()})"
 
 
+class PricingRuleQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        QuerySet.update() ไม่เรียก save()/signal และไม่อัปเดต auto_now
+        จึงกำหนด updated_at เองเพื่อให้ fingerprint ของกฎราคาเปลี่ยน (ดู pricing.rules_version)
+        """
+        kwargs.setdefault('updated_at', timezone.now())
+        rows = super().update(**kwargs)
+        PricingRule.bump_version()
+        return rows
+
+
+class PricingRule(models.Model):
+    """
+    กฎปรับราคาต่อชั่วโมง เช่น ช่วงเวลา peak, วันหยุดสุดสัปดาห์, ส่วนลดสมาชิก
+    ตารางราคาที่ cache ไว้จะหมดอายุเมื่อจำนวนกฎหรือ updated_at ล่าสุดเปลี่ยน
+    (ใช้ได้กับหลาย process) และถูกล้างทันทีใน process เดียวกันผ่าน signal ใน signals.py
+    """
+    DAY_CHOICES = [
+        ('all', 'ทุกวัน'),
+        ('weekday', 'จันทร์-ศุกร์'),
+        ('weekend', 'เสาร์-อาทิตย์'),
+    ]
+    VERSION_CACHE_KEY = 'pricing:rules_version'
+    
+    name = models.CharField(max_length=100, verbose_name='ชื่อกฎ')
+    sport_field = models.ForeignKey(
+        SportField, on_delete=models.CASCADE, related_name='pricing_rules', blank=True, null=True,
+        verbose_name='สนาม', help_text='เว้นว่างเพื่อใช้กับทุกสนาม',
+    )
+    days = models.CharField(max_length=10, choices=DAY_CHOICES, default='all', verbose_name='วัน')
+    start_time = models.TimeField(blank=True, null=True, verbose_name='เวลาเริ่มต้น')
+    end_time = models.TimeField(blank=True, null=True, verbose_name='เวลาสิ้นสุด')
+    members_only = models.BooleanField(default=False, verbose_name='เฉพาะสมาชิก')
+    multiplier = models.DecimalField(
+        max_digits=5, decimal_places=3, validators=[MinValueValidator(0)],
+        verbose_name='ตัวคูณราคา', help_text='เช่น 1.200 = แพงขึ้น 20%, 0.900 = ลด 10%',
+    )
+    is_active = models.BooleanField(default=True, verbose_name='ใช้งาน')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = PricingRuleQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = 'กฎราคา'
+        verbose_name_plural = 'กฎราคา'
+        ordering = ['sport_field', 'name']
+    
+    def __str__(self):
+        return f"{self.name} (x{self.multiplier})"
+    
+    def clean(self):
+        if (self.start_time is None) != (self.end_time is None):
+            raise ValidationError('ต้องระบุทั้งเวลาเริ่มต้นและเวลาสิ้นสุด หรือเว้นว่างทั้งคู่')
+        if self.start_time is not None and self.start_time >= self.end_time:
+            raise ValidationError('เวลาเริ่มต้นต้องน้อยกว่าเวลาสิ้นสุด')
+    
+    @classmethod
+    def bump_version(cls):
+        """ทำให้ตารางราคาที่ cache ไว้ของทุกสนามหมดอายุ"""
+        try:
+            cache.incr(cls.VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(cls.VERSION_CACHE_KEY, 1, None)
+
+
 class Booking(models.Model):
     """การจองสนาม"""
     STATUS_CHOICES = [
@@ -80,6 +150,9 @@ class Booking(models.Model):
         verbose_name = 'การจอง'
         verbose_name_plural = 'การจอง'
         ordering = ['-booking_date', '-start_time']
+        indexes = [
+            models.Index(fields=['sport_field', 'booking_date'], name='booking_field_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.sport_field.name} ({self.booking_date})"
@@ -102,20 +175,85 @@ class Booking(models.Model):
             if (self.start_time < booking.end_time and self.end_time > booking.start_time):
                 raise ValidationError(f'สนามถูกจองในช่วงเวลานี้แล้ว ({booking.start_time} - {booking.end_time})')
     
-    def save(self, *args, **kwargs):
-    # คำนวณจำนวนชั่วโมงและราคารวม
-        if self.start_time and self.end_time:
-            start = datetime.combine(datetime.today(), self.start_time)
-            end = datetime.combine(datetime.today(), self.end_time)
-            duration = (end - start).total_seconds() / 3600
-            self.hours = round(duration, 1)
+    # ฟิลด์ที่มีผลต่อราคา หากไม่เปลี่ยนจะไม่คิดราคาใหม่
+    PRICING_FIELDS = ('sport_field_id', 'booking_date', 'start_time', 'end_time')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._priced_values = instance.pricing_values()
+        return instance
     
-            # คำนวณราคารวมและปัดเศษเป็น 2 ตำแหน่ง
-            raw_total = Decimal(str(self.hours)) * self.sport_field.price_per_hour
-            self.total_price = Decimal(round(float(raw_total), 2))
+    def pricing_values(self):
+        return tuple(self.__dict__.get(field) for field in self.PRICING_FIELDS)
+    
+    def needs_pricing(self):
+        """คิดราคาเฉพาะตอนสร้างใหม่หรือเมื่อสนาม/วัน/เวลาเปลี่ยน (ราคาที่ยืนยันแล้วไม่เปลี่ยนตามกฎใหม่)"""
+        if self._state.adding or self.total_price is None:
+            return True
+        return getattr(self, '_priced_values', None) != self.pricing_values()
+    
+    def save(self, *args, **kwargs):
+        # คำนวณจำนวนชั่วโมงและราคารวมตามกฎราคาของสนาม (Decimal ทั้งหมด)
+        if self.start_time and self.end_time and self.booking_date and self.needs_pricing():
+            from .pricing import price_slot
+            self.hours, self.total_price = price_slot(
+                self.sport_field, self.booking_date, self.start_time, self.end_time,
+                is_member=self.user.is_member,
+            )
     
         try:
             self.full_clean()
             super().save(*args, **kwargs)
         except ValidationError as e:
-            raise e
\ No newline at end of file
+            raise e
+        self._priced_values = self.pricing_values()
+
+
+class ArchivedBooking(models.Model):
+    """การจองที่ถูกย้ายออกจากตาราง Booking (เสร็จสิ้น/ยกเลิก และเก่ากว่าระยะที่กำหนด)"""
+    ARCHIVABLE_STATUSES = ['cancelled', 'completed']
+    
+    # ใช้ id เดิมของ Booking เพื่อให้อ้างอิงประวัติได้เหมือนเดิม
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_bookings', verbose_name='ผู้จอง')
+    sport_field = models.ForeignKey(SportField, on_delete=models.CASCADE, related_name='archived_bookings', verbose_name='สนาม')
+    booking_date = models.DateField(verbose_name='วันที่จอง')
+    start_time = models.TimeField(verbose_name='เวลาเริ่มต้น')
+    end_time = models.TimeField(verbose_name='เวลาสิ้นสุด')
+    hours = models.DecimalField(max_digits=4, decimal_places=1, verbose_name='จำนวนชั่วโมง')
+    total_price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='ราคารวม')
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES, verbose_name='สถานะ')
+    note = models.TextField(blank=True, verbose_name='หมายเหตุ')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'การจอง (ย้อนหลัง)'
+        verbose_name_plural = 'การจอง (ย้อนหลัง)'
+        ordering = ['-booking_date', '-start_time']
+        indexes = [
+            models.Index(fields=['user', 'booking_date'], name='archived_user_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.sport_field.name} ({self.booking_date})"
+    
+    @classmethod
+    def from_booking(cls, booking):
+        """คัดลอกข้อมูลจาก Booking โดยไม่ผ่าน Booking.save()"""
+        return cls(
+            id=booking.pk,
+            user_id=booking.user_id,
+            sport_field_id=booking.sport_field_id,
+            booking_date=booking.booking_date,
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            hours=booking.hours,
+            total_price=booking.total_price,
+            status=booking.status,
+            note=booking.note,
+            created_at=booking.created_at,
+            updated_at=booking.updated_at,
+        )
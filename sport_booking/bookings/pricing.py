@@ -0,0 +1,166 @@
+"""
+คำนวณราคาการจองด้วย Decimal
+
+กฎราคา (PricingRule) ของแต่ละสนามถูก compile เป็นตารางราคาต่อชั่วโมงแบบช่วงเวลา
+(segment) แยกตาม วันธรรมดา/วันหยุด และ ผู้ใช้ทั่วไป/สมาชิก แล้ว cache ไว้
+การคิดราคาหลายช่วงเวลาพร้อมกัน (quote_slots) จึงใช้ query จำนวนคงที่ต่อ batch
+"""
+from bisect import bisect_right
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+
+from .models import SportField, PricingRule
+
+MINUTES_PER_DAY = 24 * 60
+HOURS_PLACES = Decimal('0.1')
+PRICE_PLACES = Decimal('0.01')
+SCHEDULE_CACHE_TIMEOUT = 60 * 60
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _rule_applies(rule, weekend, member):
+    if rule.members_only and not member:
+        return False
+    if rule.days == 'weekday' and weekend:
+        return False
+    if rule.days == 'weekend' and not weekend:
+        return False
+    return True
+
+
+def compile_schedule(price_per_hour, rules, weekend, member):
+    """
+    สร้างตารางราคาแบบช่วงเวลา: (starts, ends, rates)
+    ราคาของแต่ละช่วง = ราคาพื้นฐาน x ตัวคูณของทุกกฎที่ครอบคลุมช่วงนั้น
+    """
+    applicable = [rule for rule in rules if _rule_applies(rule, weekend, member)]
+    windows = [
+        (
+            _minutes(rule.start_time) if rule.start_time else 0,
+            _minutes(rule.end_time) if rule.end_time else MINUTES_PER_DAY,
+            rule.multiplier,
+        )
+        for rule in applicable
+    ]
+    boundaries = sorted({0, MINUTES_PER_DAY}.union(*[(start, end) for start, end, _ in windows]))
+
+    starts, ends, rates = [], [], []
+    for start, end in zip(boundaries, boundaries[1:]):
+        rate = price_per_hour
+        for window_start, window_end, multiplier in windows:
+            if window_start <= start and end <= window_end:
+                rate *= multiplier
+        # รวมช่วงที่ราคาเท่ากันเพื่อลดจำนวน segment
+        if rates and rates[-1] == rate:
+            ends[-1] = end
+            continue
+        starts.append(start)
+        ends.append(end)
+        rates.append(rate)
+    return starts, ends, rates
+
+
+def compile_field(sport_field, rules):
+    """ตารางราคาทั้ง 4 แบบของสนาม แยกตาม (weekend, member)"""
+    return {
+        (weekend, member): compile_schedule(sport_field.price_per_hour, rules, weekend, member)
+        for weekend in (False, True)
+        for member in (False, True)
+    }
+
+
+def _cache_key(sport_field, version):
+    return f'pricing:field:{sport_field.pk}:{sport_field.updated_at.timestamp()}:{version}'
+
+
+def rules_version():
+    """
+    fingerprint ของกฎราคาจากฐานข้อมูล (จำนวนกฎ + updated_at ล่าสุด) รวมกับ version ใน cache ของ process
+    cache แยกต่อ process จึงต้องอ่าน fingerprint จาก DB เพื่อให้ทุก worker เห็นการแก้ไขกฎทันที
+    """
+    fingerprint = PricingRule.objects.order_by().aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = fingerprint['latest'].timestamp() if fingerprint['latest'] else 0
+    return f"{fingerprint['count']}:{latest}:{cache.get(PricingRule.VERSION_CACHE_KEY, 0)}"
+
+
+def get_compiled(sport_fields):
+    """ดึงตารางราคาของหลายสนามจาก cache และ compile เฉพาะสนามที่ยังไม่มี"""
+    version = rules_version()
+    keys = {sport_field.pk: _cache_key(sport_field, version) for sport_field in sport_fields}
+    cached = cache.get_many(keys.values())
+
+    compiled = {}
+    missing = []
+    for sport_field in sport_fields:
+        if keys[sport_field.pk] in cached:
+            compiled[sport_field.pk] = cached[keys[sport_field.pk]]
+        else:
+            missing.append(sport_field)
+
+    if missing:
+        missing_ids = {sport_field.pk for sport_field in missing}
+        rules = list(PricingRule.objects.filter(
+            Q(sport_field__isnull=True) | Q(sport_field_id__in=missing_ids),
+            is_active=True,
+        ).order_by())
+        fresh = {}
+        for sport_field in missing:
+            field_rules = [rule for rule in rules if rule.sport_field_id in (None, sport_field.pk)]
+            compiled[sport_field.pk] = compile_field(sport_field, field_rules)
+            fresh[keys[sport_field.pk]] = compiled[sport_field.pk]
+        cache.set_many(fresh, SCHEDULE_CACHE_TIMEOUT)
+
+    return compiled
+
+
+def price_from_schedule(schedule, start_time, end_time):
+    """คืนค่า (hours, total_price) ของช่วงเวลา start_time - end_time"""
+    starts, ends, rates = schedule
+    start = _minutes(start_time)
+    end = _minutes(end_time)
+
+    total = Decimal(0)
+    index = bisect_right(starts, start) - 1
+    while index < len(starts) and starts[index] < end:
+        overlap = min(end, ends[index]) - max(start, starts[index])
+        if overlap > 0:
+            total += rates[index] * overlap
+        index += 1
+
+    hours = (Decimal(end - start) / 60).quantize(HOURS_PLACES, rounding=ROUND_HALF_UP)
+    total_price = (total / 60).quantize(PRICE_PLACES, rounding=ROUND_HALF_UP)
+    return hours, total_price
+
+
+def price_slot(sport_field, booking_date, start_time, end_time, is_member=False):
+    """คิดราคาหนึ่งช่วงเวลา (ใช้ใน Booking.save)"""
+    schedules = get_compiled([sport_field])[sport_field.pk]
+    weekend = booking_date.weekday() >= 5
+    return price_from_schedule(schedules[(weekend, is_member)], start_time, end_time)
+
+
+def quote_slots(slots, is_member=False):
+    """
+    คิดราคาหลายช่วงเวลาพร้อมกัน
+    slots: list ของ dict ที่มี sport_field (id), date, start_time, end_time
+    คืนค่า list ของ (hours, total_price) ตามลำดับเดิม
+    """
+    sport_fields = SportField.objects.in_bulk({slot['sport_field'] for slot in slots})
+    missing = {slot['sport_field'] for slot in slots} - sport_fields.keys()
+    if missing:
+        raise SportField.DoesNotExist(f'ไม่พบสนาม id: {sorted(missing)}')
+
+    compiled = get_compiled(list(sport_fields.values()))
+    return [
+        price_from_schedule(
+            compiled[slot['sport_field']][(slot['date'].weekday() >= 5, is_member)],
+            slot['start_time'],
+            slot['end_time'],
+        )
+        for slot in slots
+    ]
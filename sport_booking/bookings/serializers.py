@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import SportField, Booking
+from .models import SportField, Booking, ArchivedBooking, PricingRule
 from datetime import datetime
 
 User = get_user_model()
@@ -12,8 +12,8 @@ class UserSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'password', 'first_name', 'last_name', 'phone_number', 'role']
-        read_only_fields = ['id', 'role']
+        fields = ['id', 'username', 'email', 'password', 'first_name', 'last_name', 'phone_number', 'role', 'is_member']
+        read_only_fields = ['id', 'role', 'is_member']
     
     def create(self, validated_data):
         user = User.objects.create_user(
@@ -38,6 +38,25 @@ class SportFieldSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class PricingRuleSerializer(serializers.ModelSerializer):
+    """Serializer สำหรับ PricingRule"""
+    days_display = serializers.CharField(source='get_days_display', read_only=True)
+    
+    class Meta:
+        model = PricingRule
+        fields = '__all__'
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate(self, data):
+        start_time = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = data.get('end_time', getattr(self.instance, 'end_time', None))
+        if (start_time is None) != (end_time is None):
+            raise serializers.ValidationError({'end_time': 'ต้องระบุทั้งเวลาเริ่มต้นและเวลาสิ้นสุด'})
+        if start_time is not None and start_time >= end_time:
+            raise serializers.ValidationError({'end_time': 'เวลาสิ้นสุดต้องมากกว่าเวลาเริ่มต้น'})
+        return data
+
+
 class BookingSerializer(serializers.ModelSerializer):
     """Serializer สำหรับ Booking"""
     user_detail = UserSerializer(source='user', read_only=True)
@@ -71,6 +90,17 @@ class BookingSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ArchivedBookingSerializer(serializers.ModelSerializer):
+    """Serializer สำหรับ ArchivedBooking (อ่านอย่างเดียว, รูปแบบเดียวกับ BookingSerializer)"""
+    user_detail = UserSerializer(source='user', read_only=True)
+    sport_field_detail = SportFieldSerializer(source='sport_field', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    
+    class Meta:
+        model = ArchivedBooking
+        exclude = ['archived_at']
+
+
 class BookingCreateSerializer(serializers.ModelSerializer):
     """Serializer สำหรับสร้างการจอง (แบบง่าย)"""
     
@@ -90,4 +120,24 @@ class BookingCreateSerializer(serializers.ModelSerializer):
         if sport_field.status != 'available':
             raise serializers.ValidationError({'sport_field': 'สนามนี้ไม่พร้อมให้บริการ'})
         
-        return data
\ No newline at end of file
+        return data
+
+
+class PriceQuoteSlotSerializer(serializers.Serializer):
+    """ช่วงเวลาที่ต้องการคิดราคา (ใช้ id สนามเพื่อไม่ให้ query ทีละรายการ)"""
+    sport_field = serializers.IntegerField(min_value=1, max_value=2**63 - 1)
+    date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    
+    def validate(self, data):
+        if data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError({'end_time': 'เวลาสิ้นสุดต้องมากกว่าเวลาเริ่มต้น'})
+        return data
+
+
+class PriceQuoteSerializer(serializers.Serializer):
+    """คำขอคิดราคาหลายช่วงเวลาพร้อมกัน"""
+    MAX_SLOTS = 500
+    
+    slots = PriceQuoteSlotSerializer(many=True, allow_empty=False, max_length=MAX_SLOTS)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import PricingRule
+
+
+@receiver(post_save, sender=PricingRule)
+@receiver(post_delete, sender=PricingRule)
+def invalidate_pricing_cache(sender, **kwargs):
+    """ล้างตารางราคาที่ cache ไว้ (post_delete ถูกเรียกทุกแถวแม้ใช้ queryset.delete())"""
+    PricingRule.bump_version()
@@ -1,3 +1,442 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+from datetime import date, time as dt_time, timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.conf import settings
+from django.core.management import call_command, CommandError
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from django.views.generic import TemplateView
+from rest_framework.test import APIClient, APIRequestFactory
+
+from .middleware import AdmissionControlMiddleware
+from .models import User, SportField, Booking, ArchivedBooking, PricingRule
+from .pricing import compile_field, compile_schedule, price_from_schedule, price_slot
+from .throttling import IPTokenBucketThrottle
+
+MONDAY = date(2030, 1, 7)
+SATURDAY = date(2030, 1, 12)
+
+
+class ArchiveBookingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('owner', password='pass1234')
+        self.other = User.objects.create_user('other', password='pass1234')
+        self.field = SportField.objects.create(
+            name='สนาม A', sport_type='football', capacity=10, price_per_hour=Decimal('500'),
+        )
+        self.today = timezone.localdate()
+
+    def book(self, days_ago, status='completed', user=None, start=dt_time(10)):
+        return Booking.objects.create(
+            user=user or self.user, sport_field=self.field, status=status,
+            booking_date=self.today - timedelta(days=days_ago),
+            start_time=start, end_time=dt_time(start.hour + 1),
+        )
+
+    def archive(self, **options):
+        call_command('archive_bookings', days=30, stdout=StringIO(), **options)
+
+    def test_moves_only_old_completed_or_cancelled(self):
+        old_completed = self.book(60, 'completed')
+        old_cancelled = self.book(61, 'cancelled')
+        old_pending = self.book(62, 'pending')
+        old_confirmed = self.book(63, 'confirmed')
+        recent_completed = self.book(10, 'completed')
+        boundary = self.book(30, 'completed')
+
+        self.archive()
+
+        self.assertEqual(
+            set(ArchivedBooking.objects.values_list('pk', flat=True)),
+            {old_completed.pk, old_cancelled.pk},
+        )
+        self.assertEqual(
+            set(Booking.objects.values_list('pk', flat=True)),
+            {old_pending.pk, old_confirmed.pk, recent_completed.pk, boundary.pk},
+        )
+        archived = ArchivedBooking.objects.get(pk=old_completed.pk)
+        self.assertEqual(archived.total_price, old_completed.total_price)
+        self.assertEqual(archived.created_at, old_completed.created_at)
+
+    def test_resumes_after_max_batches(self):
+        bookings = [self.book(40 + days) for days in range(5)]
+
+        self.archive(batch_size=2, max_batches=1)
+        self.assertEqual(ArchivedBooking.objects.count(), 2)
+        self.assertEqual(Booking.objects.count(), 3)
+
+        self.archive(batch_size=2)
+        self.assertEqual(Booking.objects.count(), 0)
+        self.assertEqual(
+            sorted(ArchivedBooking.objects.values_list('pk', flat=True)),
+            sorted(booking.pk for booking in bookings),
+        )
+
+    def test_id_conflict_aborts_batch_without_losing_bookings(self):
+        booking = self.book(60)
+        existing = ArchivedBooking.from_booking(booking)
+        existing.note = 'restored from dump'
+        existing.save()
+
+        with self.assertRaises(CommandError):
+            self.archive()
+
+        self.assertTrue(Booking.objects.filter(pk=booking.pk).exists())
+        self.assertEqual(ArchivedBooking.objects.get(pk=booking.pk).note, 'restored from dump')
+
+    def test_dry_run_changes_nothing(self):
+        self.book(60)
+        self.archive(dry_run=True)
+        self.assertEqual(ArchivedBooking.objects.count(), 0)
+
+    def test_retrieve_falls_back_to_archive_for_owner_only(self):
+        booking = self.book(60)
+        self.archive()
+        client = APIClient()
+
+        client.force_authenticate(self.user)
+        response = client.get(f'/api/bookings/{booking.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'completed')
+
+        client.force_authenticate(self.other)
+        self.assertEqual(client.get(f'/api/bookings/{booking.pk}/').status_code, 404)
+
+    def test_retrieve_non_numeric_id_is_404(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/bookings/abc/').status_code, 404)
+
+    def test_history_merges_both_tables_newest_first(self):
+        self.book(50)
+        self.book(70)
+        self.book(60, 'pending')
+        self.book(60, 'completed', start=dt_time(8))
+        self.book(5, 'pending')
+        self.book(55, 'completed', user=self.other)
+        self.archive()
+        self.assertEqual(ArchivedBooking.objects.count(), 4)
+
+        expected = [
+            (str(self.today - timedelta(days=days)), start)
+            for days, start in [(5, '10:00:00'), (50, '10:00:00'), (60, '10:00:00'), (60, '08:00:00'), (70, '10:00:00')]
+        ]
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for url in ['/api/bookings/', '/api/bookings/my_bookings/']:
+            response = client.get(url)
+            self.assertEqual(
+                [(booking['booking_date'], booking['start_time']) for booking in response.data],
+                expected,
+            )
+
+
+class PricingScheduleTests(SimpleTestCase):
+    def test_nested_and_overlapping_windows_multiply(self):
+        rules = [
+            PricingRule(name='peak', start_time=dt_time(10), end_time=dt_time(14), multiplier=Decimal('1.5')),
+            PricingRule(name='late', start_time=dt_time(12), end_time=dt_time(16), multiplier=Decimal('2')),
+            PricingRule(name='inner', start_time=dt_time(12, 30), end_time=dt_time(13), multiplier=Decimal('0.5')),
+        ]
+        starts, ends, rates = compile_schedule(Decimal('100'), rules, weekend=False, member=False)
+
+        self.assertEqual(starts, [0, 600, 720, 750, 780, 840, 960])
+        self.assertEqual(ends, [600, 720, 750, 780, 840, 960, 1440])
+        self.assertEqual(rates, [
+            Decimal('100'), Decimal('150'), Decimal('300'), Decimal('150'),
+            Decimal('300'), Decimal('200'), Decimal('100'),
+        ])
+
+    def test_weekend_and_member_combinations(self):
+        rules = [
+            PricingRule(name='weekend', days='weekend', multiplier=Decimal('1.2')),
+            PricingRule(name='weekday', days='weekday', multiplier=Decimal('1.1')),
+            PricingRule(name='member', members_only=True, multiplier=Decimal('0.9')),
+        ]
+        schedules = compile_field(SportField(price_per_hour=Decimal('100')), rules)
+
+        def hourly(weekend, member):
+            return price_from_schedule(schedules[(weekend, member)], dt_time(8), dt_time(9))[1]
+
+        self.assertEqual(hourly(False, False), Decimal('110.00'))
+        self.assertEqual(hourly(False, True), Decimal('99.00'))
+        self.assertEqual(hourly(True, False), Decimal('120.00'))
+        self.assertEqual(hourly(True, True), Decimal('108.00'))
+
+    def test_slot_crossing_segment_boundary(self):
+        rules = [PricingRule(name='peak', start_time=dt_time(10), end_time=dt_time(12), multiplier=Decimal('1.5'))]
+        schedule = compile_schedule(Decimal('500'), rules, weekend=False, member=False)
+
+        self.assertEqual(
+            price_from_schedule(schedule, dt_time(9, 30), dt_time(11)),
+            (Decimal('1.5'), Decimal('1000.00')),
+        )
+        # 20 นาทีที่ 500/ชม. = 166.666... ปัดเป็น 166.67
+        self.assertEqual(
+            price_from_schedule(schedule, dt_time(9), dt_time(9, 20)),
+            (Decimal('0.3'), Decimal('166.67')),
+        )
+
+
+class PricingEngineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('regular', password='pass1234')
+        self.field = SportField.objects.create(
+            name='สนาม A', sport_type='football', capacity=10, price_per_hour=Decimal('500'),
+        )
+
+    def price(self, start=dt_time(10), end=dt_time(12)):
+        return price_slot(self.field, MONDAY, start, end)[1]
+
+    def test_cached_prices_follow_rule_changes(self):
+        PricingRule.objects.create(name='x2', multiplier=Decimal('2'))
+        self.assertEqual(self.price(), Decimal('2000.00'))
+
+        PricingRule.objects.filter(name='x2').update(multiplier=Decimal('3'))
+        self.assertEqual(self.price(), Decimal('3000.00'))
+
+        PricingRule.objects.all().delete()
+        self.assertEqual(self.price(), Decimal('1000.00'))
+
+    def test_rule_change_seen_by_other_processes(self):
+        self.assertEqual(self.price(), Decimal('1000.00'))
+        PricingRule.objects.create(name='x2', multiplier=Decimal('2'))
+        # worker อื่นไม่เห็น version ใน cache ของ process นี้
+        cache.delete(PricingRule.VERSION_CACHE_KEY)
+        self.assertEqual(self.price(), Decimal('2000.00'))
+
+    def test_confirm_keeps_accepted_price(self):
+        booking = Booking.objects.create(
+            user=self.user, sport_field=self.field, booking_date=MONDAY,
+            start_time=dt_time(10), end_time=dt_time(12),
+        )
+        PricingRule.objects.create(name='peak', start_time=dt_time(10), end_time=dt_time(12), multiplier=Decimal('1.5'))
+
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.status = 'confirmed'
+        booking.save()
+        self.assertEqual(booking.total_price, Decimal('1000.00'))
+
+        booking.end_time = dt_time(11)
+        booking.save()
+        self.assertEqual(booking.total_price, Decimal('750.00'))
+
+    def test_members_only_rule_applies_to_members_only(self):
+        PricingRule.objects.create(name='member', members_only=True, multiplier=Decimal('0.5'))
+        member = User.objects.create_user('vip', password='pass1234', is_member=True)
+
+        regular = Booking.objects.create(
+            user=self.user, sport_field=self.field, booking_date=MONDAY,
+            start_time=dt_time(8), end_time=dt_time(9),
+        )
+        discounted = Booking.objects.create(
+            user=member, sport_field=self.field, booking_date=MONDAY,
+            start_time=dt_time(9), end_time=dt_time(10),
+        )
+        self.assertEqual(regular.total_price, Decimal('500.00'))
+        self.assertEqual(discounted.total_price, Decimal('250.00'))
+
+
+class PriceQuoteApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user('member', password='pass1234', is_member=True)
+        self.field = SportField.objects.create(
+            name='สนาม A', sport_type='football', capacity=10, price_per_hour=Decimal('500'),
+        )
+        PricingRule.objects.create(name='peak', start_time=dt_time(10), end_time=dt_time(12), multiplier=Decimal('1.5'))
+        PricingRule.objects.create(name='weekend', days='weekend', multiplier=Decimal('1.2'))
+        PricingRule.objects.create(name='member', members_only=True, multiplier=Decimal('0.9'))
+
+    def quote(self, *slots):
+        return self.client.post('/api/sport-fields/quote/', {'slots': list(slots)}, format='json')
+
+    def slot(self, booking_date=MONDAY, start='09:30', end='11:00', sport_field=None):
+        return {
+            'sport_field': sport_field or self.field.pk,
+            'date': str(booking_date),
+            'start_time': start,
+            'end_time': end,
+        }
+
+    def test_quotes_many_slots(self):
+        response = self.quote(self.slot(), self.slot(SATURDAY, '18:00', '19:00'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(slot['hours'], slot['total_price']) for slot in response.data['slots']],
+            [('1.5', '1000.00'), ('1.0', '600.00')],
+        )
+
+    def test_member_price_for_members_only(self):
+        self.client.force_authenticate(self.user)
+        response = self.quote(self.slot())
+        self.assertEqual(response.data['slots'][0]['total_price'], '900.00')
+
+        self.client.force_authenticate(User.objects.create_user('regular', password='pass1234'))
+        response = self.quote(self.slot())
+        self.assertEqual(response.data['slots'][0]['total_price'], '1000.00')
+
+    def test_unknown_sport_field(self):
+        response = self.quote(self.slot(), self.slot(sport_field=999))
+        self.assertEqual(response.status_code, 400)
+
+        response = self.quote(self.slot(sport_field=2 ** 70))
+        self.assertEqual(response.status_code, 400)
+
+
+class IPBurstThrottle(IPTokenBucketThrottle):
+    rate = '3/minute'
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get('/api/sport-fields/', REMOTE_ADDR='10.0.0.1')
+        self.now = 1000.0
+        self.throttle_timer = lambda: self.now
+
+    def make_throttle(self):
+        throttle = IPBurstThrottle()
+        throttle.timer = self.throttle_timer
+        return throttle
+
+    def test_burst_then_refill(self):
+        for _ in range(3):
+            self.assertTrue(self.make_throttle().allow_request(self.request, None))
+
+        throttle = self.make_throttle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertAlmostEqual(throttle.wait(), 20.0)
+
+        # เติม 1 token ทุก 20 วินาที
+        self.now += 20
+        self.assertTrue(self.make_throttle().allow_request(self.request, None))
+        self.assertFalse(self.make_throttle().allow_request(self.request, None))
+
+    def test_separate_bucket_per_ip(self):
+        for _ in range(3):
+            self.make_throttle().allow_request(self.request, None)
+        other = APIRequestFactory().get('/api/sport-fields/', REMOTE_ADDR='10.0.0.2')
+        self.assertTrue(self.make_throttle().allow_request(other, None))
+
+
+@override_settings(BOOKING_ADMISSION={
+    'PATH_PREFIX': '/api/',
+    'MAX_CONCURRENT': 2,
+    'MAX_QUEUE': 4,
+    'QUEUE_TIMEOUT': 0.1,
+    'RETRY_AFTER': 1,
+})
+class AdmissionControlMiddlewareTests(SimpleTestCase):
+    SERVICE_TIME = 0.02
+
+    def setUp(self):
+        def slow_view(request):
+            time.sleep(self.SERVICE_TIME)
+            return HttpResponse('ok')
+
+        self.middleware = AdmissionControlMiddleware(slow_view)
+        self.factory = RequestFactory()
+
+    def timed_request(self, _):
+        request = self.factory.post('/api/bookings/')
+        started = time.monotonic()
+        response = self.middleware(request)
+        return time.monotonic() - started, response
+
+    def test_reads_are_not_queued(self):
+        response = self.middleware(self.factory.get('/api/bookings/'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_p99_latency_bounded_under_overload(self):
+        requests_count = 200
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            results = list(pool.map(self.timed_request, range(requests_count)))
+
+        latencies = sorted(latency for latency, _ in results)
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        accepted = [response for _, response in results if response.status_code == 200]
+        rejected = [response for _, response in results if response.status_code == 429]
+
+        self.assertEqual(len(accepted) + len(rejected), requests_count)
+        self.assertTrue(accepted)
+        self.assertTrue(rejected)
+        self.assertTrue(all(response['Retry-After'] == '1' for response in rejected))
+        # รอในคิวไม่เกิน QUEUE_TIMEOUT + เวลาประมวลผลหนึ่งครั้ง (เผื่อ scheduling ของ thread)
+        # ถ้าไม่มี admission control จะเป็นประมาณ requests_count / MAX_CONCURRENT * SERVICE_TIME = 2 วินาที
+        self.assertLess(p99, 0.1 + self.SERVICE_TIME + 0.2)
+
+
+class CachedPageTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_template_pages_are_cached(self):
+        with mock.patch.object(TemplateView, 'get', autospec=True, side_effect=TemplateView.get) as render:
+            first = self.client.get('/api/index/')
+            second = self.client.get('/api/index/')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn(f'max-age={settings.TEMPLATE_PAGE_CACHE_SECONDS}', first['Cache-Control'])
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(render.call_count, 1)
+
+    def test_admin_and_swagger_render_without_manifest(self):
+        self.assertEqual(self.client.get('/admin/login/').status_code, 200)
+        self.assertEqual(self.client.get('/swagger/').status_code, 200)
+
+
+class StaticFilesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.source = Path(tempfile.mkdtemp())
+        cls.root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.source)
+        cls.addClassCleanup(shutil.rmtree, cls.root)
+        (cls.source / 'site.css').write_text('.booking-slot { color: #333; }\n' * 200)
+
+        # collect เฉพาะไฟล์ทดสอบ ไม่ต้อง collect ไฟล์ของ admin/DRF ทั้งหมด
+        overrides = override_settings(
+            STATIC_ROOT=cls.root,
+            STATICFILES_DIRS=[cls.source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        overrides.enable()
+        cls.addClassCleanup(overrides.disable)
+        call_command('collectstatic', '--noinput', verbosity=0)
+        cls.hashed = json.loads((cls.root / 'staticfiles.json').read_text())['paths']['site.css']
+
+    def test_collectstatic_fingerprints_and_precompresses(self):
+        self.assertNotEqual(self.hashed, 'site.css')
+        self.assertTrue((self.root / f'{self.hashed}.gz').exists())
+        self.assertTrue((self.root / f'{self.hashed}.br').exists())
+
+    def test_hashed_file_is_immutable_and_compressed(self):
+        response = self.client.get(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+        response = self.client.get(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_unhashed_file_gets_short_max_age(self):
+        response = self.client.get('/static/site.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
@@ -0,0 +1,53 @@
+import threading
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket แทน sliding window ของ SimpleRateThrottle
+    rate 'N/period' หมายถึงถังจุได้ N token และเติมกลับเต็มถังภายใน period
+    เก็บเพียง (tokens, เวลาล่าสุด) ต่อ key ใน cache จึงใช้หน่วยความจำคงที่
+    """
+    lock = threading.Lock()
+    
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        
+        self.refill_rate = self.num_requests / self.duration
+        with self.lock:
+            self.now = self.timer()
+            tokens, last = self.cache.get(self.key, (self.num_requests, self.now))
+            self.tokens = min(self.num_requests, tokens + (self.now - last) * self.refill_rate)
+            allowed = self.tokens >= 1
+            if allowed:
+                self.tokens -= 1
+            self.cache.set(self.key, (self.tokens, self.now), self.duration)
+        return allowed
+    
+    def wait(self):
+        """เวลา (วินาที) จนกว่าจะมี token ถัดไป"""
+        return max(0, (1 - self.tokens) / self.refill_rate)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """จำกัดอัตราต่อผู้ใช้ที่ล็อกอินแล้ว"""
+    scope = 'user'
+    
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """จำกัดอัตราต่อ IP (รวมผู้ใช้ที่ยังไม่ล็อกอิน)"""
+    scope = 'ip'
+    
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
@@ -1,13 +1,22 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from django.conf import settings
+from django.views.decorators.cache import cache_page
 from django.views.generic import TemplateView
-from .views import UserViewSet, SportFieldViewSet, BookingViewSet 
+from .views import UserViewSet, SportFieldViewSet, BookingViewSet, PricingRuleViewSet
 
 router = DefaultRouter()
 router.register('users', UserViewSet, basename='user')
 router.register('sport-fields', SportFieldViewSet, basename='sportfield')
 router.register('bookings', BookingViewSet, basename='booking')
+router.register('pricing-rules', PricingRuleViewSet, basename='pricingrule')
+
+
+def cached_page(template_name):
+    """หน้า HTML ไม่ขึ้นกับผู้ใช้ (ข้อมูลโหลดผ่าน API) จึง cache ทั้งหน้าได้"""
+    return cache_page(settings.TEMPLATE_PAGE_CACHE_SECONDS)(TemplateView.as_view(template_name=template_name))
+
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -15,11 +24,11 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # HTML Pages
-    path('login-form/', TemplateView.as_view(template_name='bookings/login_form.html'), name='login_form'),
-    path('register-form/', TemplateView.as_view(template_name='bookings/register_form.html'), name='register_form'),
-    path('index/', TemplateView.as_view(template_name='bookings/index.html'), name='index'),
-    path('my-bookings/', TemplateView.as_view(template_name='bookings/my_bookings.html'), name='my_bookings_page'),
-    path('admin-dashboard/', TemplateView.as_view(template_name='bookings/admin_dashboard.html'), name='admin_dashboard'),
-    path('sport-field/', TemplateView.as_view(template_name='bookings/sport_field.html'), name='sport_field'),
-    path('edit-sport-field/', TemplateView.as_view(template_name='bookings/edit_sport_field.html'), name='edit_sport_field'),
+    path('login-form/', cached_page('bookings/login_form.html'), name='login_form'),
+    path('register-form/', cached_page('bookings/register_form.html'), name='register_form'),
+    path('index/', cached_page('bookings/index.html'), name='index'),
+    path('my-bookings/', cached_page('bookings/my_bookings.html'), name='my_bookings_page'),
+    path('admin-dashboard/', cached_page('bookings/admin_dashboard.html'), name='admin_dashboard'),
+    path('sport-field/', cached_page('bookings/sport_field.html'), name='sport_field'),
+    path('edit-sport-field/', cached_page('bookings/edit_sport_field.html'), name='edit_sport_field'),
 ]
\ No newline at end of file
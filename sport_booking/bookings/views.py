@@ -1,16 +1,23 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
-from django.shortcuts import render  
-from .models import SportField, Booking
+from django.http import Http404
+from django.shortcuts import render
+from .models import SportField, Booking, ArchivedBooking, PricingRule
+from .pricing import quote_slots
 from .serializers import (
     UserSerializer, 
     SportFieldSerializer, 
+    PricingRuleSerializer,
+    PriceQuoteSerializer,
     BookingSerializer,
+    ArchivedBookingSerializer,
     BookingCreateSerializer
 )
 from datetime import datetime, timedelta
+import heapq
 
 User = get_user_model()
 
@@ -45,7 +52,7 @@ class SportFieldViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         # อนุญาตให้ทุกคนเข้าถึง list, retrieve, availability โดยไม่ต้องล็อกอิน
-        if self.action in ['list', 'retrieve', 'availability']:
+        if self.action in ['list', 'retrieve', 'availability', 'quote']:
             return [permissions.AllowAny()]
         return [IsAdminUser()]
     
@@ -87,6 +94,39 @@ class SportFieldViewSet(viewsets.ModelViewSet):
             'booked_slots': booked_slots,
             'status': sport_field.status
         })
+    
+    @action(detail=False, methods=['post'])
+    def quote(self, request):
+        """คิดราคาหลายช่วงเวลา/หลายสนามพร้อมกันตามกฎราคา"""
+        serializer = PriceQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        slots = serializer.validated_data['slots']
+        
+        try:
+            prices = quote_slots(slots, is_member=request.user.is_authenticated and request.user.is_member)
+        except SportField.DoesNotExist as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'slots': [
+                {
+                    'sport_field': slot['sport_field'],
+                    'date': slot['date'],
+                    'start_time': slot['start_time'].strftime('%H:%M'),
+                    'end_time': slot['end_time'].strftime('%H:%M'),
+                    'hours': str(hours),
+                    'total_price': str(total_price),
+                }
+                for slot, (hours, total_price) in zip(slots, prices)
+            ]
+        })
+
+
+class PricingRuleViewSet(viewsets.ModelViewSet):
+    """ViewSet สำหรับจัดการกฎราคา (Admin เท่านั้น)"""
+    queryset = PricingRule.objects.all()
+    serializer_class = PricingRuleSerializer
+    permission_classes = [IsAdminUser]
 
 
 class BookingViewSet(viewsets.ModelViewSet):
@@ -105,16 +145,50 @@ class BookingViewSet(viewsets.ModelViewSet):
             return Booking.objects.all()
         return Booking.objects.filter(user=self.request.user)
     
+    def get_archived_queryset(self):
+        """การจองที่ถูกย้ายไปเก็บแล้ว (สิทธิ์เหมือน get_queryset)"""
+        if self.request.user.role == 'admin':
+            return ArchivedBooking.objects.all()
+        return ArchivedBooking.objects.filter(user=self.request.user)
+    
+    def history_data(self, bookings, archived_bookings):
+        """รวมการจองจากตารางหลักและตาราง archive เรียงตามวันที่/เวลาล่าสุดก่อน"""
+        bookings = bookings.select_related('user', 'sport_field').order_by('-booking_date', '-start_time')
+        archived_bookings = archived_bookings.select_related('user', 'sport_field').order_by('-booking_date', '-start_time')
+        context = self.get_serializer_context()
+        merged = heapq.merge(
+            bookings, archived_bookings,
+            key=lambda booking: (booking.booking_date, booking.start_time),
+            reverse=True,
+        )
+        return [
+            (ArchivedBookingSerializer if isinstance(booking, ArchivedBooking) else BookingSerializer)(booking, context=context).data
+            for booking in merged
+        ]
+    
+    def list(self, request, *args, **kwargs):
+        """แสดงการจองทั้งหมดรวมถึงประวัติที่ถูกย้ายไปเก็บแล้ว"""
+        bookings = self.filter_queryset(self.get_queryset())
+        return Response(self.history_data(bookings, self.get_archived_queryset()))
+    
+    def retrieve(self, request, *args, **kwargs):
+        """ดูรายละเอียดการจอง หากไม่พบในตารางหลักจะค้นหาใน archive"""
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archived = get_object_or_404(self.get_archived_queryset(), pk=kwargs['pk'])
+            return Response(ArchivedBookingSerializer(archived, context=self.get_serializer_context()).data)
+    
     def perform_create(self, serializer):
         """บันทึกการจองพร้อมกำหนด user"""
         serializer.save(user=self.request.user)
     
     @action(detail=False, methods=['get'])
     def my_bookings(self, request):
-        """ดูการจองของตัวเอง"""
+        """ดูการจองของตัวเอง (รวมประวัติที่ถูกย้ายไปเก็บแล้ว)"""
         bookings = Booking.objects.filter(user=request.user)
-        serializer = self.get_serializer(bookings, many=True)
-        return Response(serializer.data)
+        archived_bookings = ArchivedBooking.objects.filter(user=request.user)
+        return Response(self.history_data(bookings, archived_bookings))
     
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
@@ -30,6 +30,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'bookings.middleware.AdmissionControlMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,9 +79,23 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_DIRS = [
-    BASE_DIR / 'static',
-]
+
+# collectstatic จะใส่ hash ในชื่อไฟล์และสร้างไฟล์ .gz/.br ไว้ล่วงหน้า
+# WhiteNoise เสิร์ฟไฟล์ที่มี hash พร้อม Cache-Control: immutable
+# (มีผลกับไฟล์ของ admin, DRF และ drf-yasg เท่านั้น หน้า HTML ใน templates/ ไม่ได้ใช้ไฟล์ static)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+# ถ้ายังไม่ได้รัน collectstatic (ไม่มี staticfiles.json) ให้ใช้ชื่อไฟล์เดิมแทนการ error 500
+WHITENOISE_MANIFEST_STRICT = False
+
+# เวลาที่ cache หน้า HTML (TemplateView ใน bookings/urls.py)
+TEMPLATE_PAGE_CACHE_SECONDS = 60 * 15
 
 # Media files
 MEDIA_URL = '/media/'
@@ -96,8 +112,37 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # เปลี่ยนเป็น AllowAny
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'bookings.throttling.UserTokenBucketThrottle',
+        'bookings.throttling.IPTokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': '120/minute',
+        'ip': '300/minute',
+    },
+}
+
+# Cache (ใช้กับ throttling และตารางราคา) - แยกต่อ process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sport-booking',
+    }
+}
+
+# Admission control สำหรับ request ที่เขียนข้อมูล (bookings.middleware)
+BOOKING_ADMISSION = {
+    'PATH_PREFIX': '/api/',
+    'MAX_CONCURRENT': 4,
+    'MAX_QUEUE': 16,
+    'QUEUE_TIMEOUT': 2.0,  # วินาที
+    'RETRY_AFTER': 1,  # วินาที
 }
 
+# Booking archive (python manage.py archive_bookings)
+BOOKING_ARCHIVE_AFTER_DAYS = 180  # ย้ายการจองที่เสร็จสิ้น/ยกเลิกที่เก่ากว่านี้ออกจากตารางหลัก
+BOOKING_ARCHIVE_BATCH_SIZE = 500
+
 # Custom User Model
 AUTH_USER_MODEL = 'bookings.User'  # เปลี่ยนเป็นชื่อแอปของคุณ
 